@@ -0,0 +1,666 @@
+"""
+Dependency analysis of the code blocks in the 'Examples' section of
+SciPy docstrings.
+
+The blocks are the strings in the list returned by `extract_example`
+(each block is one `>>> ` line plus its `... ` continuation lines).
+Each block is parsed with `ast` to find the names that it defines and
+the names that it uses, and these are used to build a def-use graph of
+the blocks.
+
+Commands:
+
+    graph fully_qualified_scipy_name
+        Print the numbered blocks of the example, with the blocks that
+        each one depends on.
+    slice fully_qualified_scipy_name block_number
+        Print the set of blocks needed to reproduce the given block.
+    irun fully_qualified_scipy_name block_number
+        Like `irun` in `extract_example_code.py`, but only the set of
+        blocks needed to reproduce the given block is run.
+    setup fully_qualified_module_name
+        Report the setup blocks (imports and assignments) that are
+        repeated in the examples of two or more objects in the module.
+
+The analysis is static and errs on the side of keeping blocks, so the
+set of blocks is not always the smallest one.  It can still miss a
+block when the change is not visible in the syntax, e.g.
+
+* a function that changes an argument in place in a call whose result
+  is assigned (`b = f(a)`);
+* an alias that is not created by a plain assignment (e.g. an object
+  stored in a list, or a view returned by a function such as
+  `np.asarray(x)`);
+* a call through an object created by an imported module (other than
+  the results of `matplotlib.pyplot`) that changes the state of the
+  module, or a method of an instance that uses names defined after the
+  instance was created.
+"""
+
+import ast
+from collections import defaultdict, namedtuple
+import importlib
+import sys
+from extract_example_code import extract_example, module_example, irun
+
+
+# Calls of functions whose fully qualified names start with one of these
+# prefixes change the state of their package, even if their result is
+# assigned (e.g. `r = np.random.rand(3)`).
+_stateful_prefixes = ('matplotlib.pyplot.', 'random.', 'numpy.random.')
+
+# Methods that change the state of NumPy (its global random number
+# generator) when they are called, e.g. `stats.norm.rvs(size=3)`.
+_stateful_methods = {'rvs'}
+
+# The results of calls of functions whose fully qualified names start
+# with one of these prefixes are part of the state of their package, so
+# changing them changes the package (e.g. `ax.plot(x)` after
+# `fig, ax = plt.subplots()`).
+_state_result_prefixes = ('matplotlib.pyplot.',)
+
+# Functions that don't change the state of their package or their
+# arguments, so a call whose result is discarded (e.g. to display the
+# result) is not a modification.
+_pure_functions = (
+    {'numpy.' + name for name in [
+        'abs', 'all', 'allclose', 'any', 'arange', 'argmax', 'argmin',
+        'argsort', 'array', 'array_equal', 'asarray', 'column_stack',
+        'concatenate', 'cos', 'cumsum', 'diff', 'dot', 'exp', 'eye',
+        'full', 'hstack', 'isclose', 'isfinite', 'isinf', 'isnan',
+        'linspace', 'log', 'log10', 'max', 'mean', 'median', 'min',
+        'ones', 'prod', 'ptp', 'round', 'shape', 'sin', 'sort', 'sqrt',
+        'std', 'sum', 'tan', 'unique', 'var', 'vstack', 'where', 'zeros',
+        'linalg.norm',
+    ]}
+    | {'abs', 'bool', 'float', 'int', 'isinstance', 'len', 'list', 'max',
+       'min', 'print', 'repr', 'round', 'sorted', 'str', 'sum', 'tuple',
+       'type'}
+)
+_pure_prefixes = ('math.',)
+
+# SciPy uses the state of NumPy (e.g. its global random number generator
+# and its print options), so the two packages share their state.
+_shared_state = {'scipy': 'numpy'}
+
+
+# A call at the top level of a block.  `dotted` is the dotted name of the
+# function (e.g. 'np.random.seed'), or None if the function is not a name
+# or an attribute of a name; `base` is the first name in `func` (e.g.
+# 'ax' in `ax.plot(x)` or 'f' in `f(1)(2)`), or None.  `discarded` is True
+# if the call is an expression statement.  `args` is the list of the
+# names passed as arguments, and `targets` is the list of the names that
+# the result is assigned to.
+_Call = namedtuple('_Call', ['dotted', 'base', 'discarded', 'args',
+                             'targets'])
+
+
+def _state_key(origin):
+    """
+    Return the name used in the def-use graph for the state of the package
+    of the fully qualified name `origin` (e.g. '<numpy>' for 'numpy.random').
+    """
+    package = origin.split('.')[0]
+    return f'<{_shared_state.get(package, package)}>'
+
+
+class _NameCollector(ast.NodeVisitor):
+    """
+    Collect the names defined and used by a block of code.
+
+    Only names bound at the top level of the block are definitions;
+    names bound inside function and class bodies, lambdas and
+    comprehensions are local to those scopes.  A name that is used by
+    a method call, an attribute or subscript assignment, an augmented
+    assignment or a `del` is also "modified" by the block, e.g.
+
+        >>> ax.plot(x, y)
+        >>> a[0] = 1
+        >>> total += 1
+
+    A modification is a definition that does not replace the previous
+    definitions of the name.  A name bound inside the body of an `if`,
+    `for`, `while`, `try`, `with` or `match` statement is modified, not
+    defined, because the body might not be run; these names are also
+    collected in `cond_defs`.
+
+    The other attributes are used by `def_use_graph`: the fully qualified
+    names of the imported names are collected in `imports` (e.g.
+    `{'np': 'numpy'}`), the names that are the base of an attribute or
+    subscript assignment (or `del` or augmented assignment) in `stores`,
+    the free names of the functions, classes and lambdas bound to names
+    in `functions`, the calls in `calls` (see `_Call`), and the
+    `(target, source)` pairs of assignments such as `y = x` or
+    `y = x[::2]`, where `y` might be an alias of `x`, in `aliases`.
+    """
+
+    def __init__(self):
+        self.defs = set()
+        self.imports = {}
+        self.mods = set()
+        self.cond_defs = set()
+        self.stores = set()
+        self.uses = set()
+        self.functions = {}
+        self.calls = []
+        self.aliases = []
+        self._depth = 0
+        self._cond_depth = 0
+        # The sets of names used in the enclosing function, class and
+        # lambda bodies.
+        self._scopes = []
+        # The call that is the value of the current expression statement,
+        # and the call whose result is assigned to names (with the names).
+        self._discarded = None
+        self._assigned = (None, [])
+
+    def _bind(self, name):
+        if self._depth == 0:
+            if self._cond_depth == 0:
+                self.defs.add(name)
+            else:
+                self.mods.add(name)
+                self.cond_defs.add(name)
+
+    def _base_name(self, node):
+        while isinstance(node, (ast.Attribute, ast.Subscript, ast.Call)):
+            node = node.func if isinstance(node, ast.Call) else node.value
+        if isinstance(node, ast.Name):
+            return node.id
+        return None
+
+    def _dotted_name(self, node):
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        parts.append(node.id)
+        return '.'.join(reversed(parts))
+
+    def _modify(self, node):
+        name = self._base_name(node)
+        if name is not None and self._depth == 0:
+            self.mods.add(name)
+
+    def _store(self, node):
+        self._modify(node)
+        name = self._base_name(node)
+        if name is not None and self._depth == 0:
+            self.stores.add(name)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.uses.add(node.id)
+            if self._scopes:
+                self._scopes[-1].add(node.id)
+        elif isinstance(node.ctx, ast.Store):
+            self._bind(node.id)
+        else:
+            # ast.Del
+            self.uses.add(node.id)
+            self._modify(node)
+
+    def _bind_import(self, name, origin):
+        self._bind(name)
+        if self._depth == 0:
+            self.imports[name] = origin
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            if alias.asname is None:
+                # `import a.b` binds `a`.
+                name = alias.name.split('.')[0]
+                self._bind_import(name, name)
+            else:
+                self._bind_import(alias.asname, alias.name)
+
+    def visit_ImportFrom(self, node):
+        module = node.module or ''
+        for alias in node.names:
+            if alias.name != '*':
+                origin = f'{module}.{alias.name}' if module else alias.name
+                self._bind_import(alias.asname or alias.name, origin)
+
+    def _visit_scope(self, node, name=None):
+        """
+        Visit a function, class, lambda or comprehension, and return the
+        set of the names used in it.  If `name` is not None, the free
+        names are recorded in `functions[name]`.
+        """
+        if name is not None:
+            self._bind(name)
+        self._depth += 1
+        self._scopes.append(set())
+        self.generic_visit(node)
+        used = self._scopes.pop()
+        self._depth -= 1
+        if self._scopes:
+            self._scopes[-1].update(used)
+        if name is not None and self._depth == 0:
+            self.functions[name] = used
+        return used
+
+    def visit_FunctionDef(self, node):
+        self._visit_scope(node, node.name)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+
+    def _target_names(self, targets):
+        names = []
+        for target in targets:
+            if isinstance(target, ast.Starred):
+                target = target.value
+            if isinstance(target, ast.Name):
+                names.append(target.id)
+            elif isinstance(target, (ast.Tuple, ast.List)):
+                names.extend(self._target_names(target.elts))
+        return names
+
+    def visit_Assign(self, node):
+        if (isinstance(node.value, ast.Lambda)
+                and all(isinstance(target, ast.Name)
+                        for target in node.targets)):
+            # e.g. `f = lambda x: c*x`
+            used = self._visit_scope(node.value)
+            for target in node.targets:
+                self.visit(target)
+                if self._depth == 0:
+                    self.functions[target.id] = used
+            return
+        if self._depth == 0:
+            source = self._base_name(node.value)
+            if (source is not None
+                    and isinstance(node.value, (ast.Name, ast.Attribute,
+                                                ast.Subscript, ast.Call))):
+                # e.g. `y = x`, `y = x[::2]` or `y = x.reshape(2, 3)`.
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        self.aliases.append((target.id, source))
+            if isinstance(node.value, ast.Call):
+                self._assigned = (node.value,
+                                  self._target_names(node.targets))
+        self.generic_visit(node)
+
+    def _visit_conditional(self, node):
+        self._cond_depth += 1
+        self.generic_visit(node)
+        self._cond_depth -= 1
+
+    visit_If = _visit_conditional
+    visit_For = _visit_conditional
+    visit_AsyncFor = _visit_conditional
+    visit_While = _visit_conditional
+    visit_Try = _visit_conditional
+    visit_TryStar = _visit_conditional
+    visit_With = _visit_conditional
+    visit_AsyncWith = _visit_conditional
+    visit_Match = _visit_conditional
+
+    def visit_Lambda(self, node):
+        self._visit_scope(node)
+
+    visit_ListComp = visit_Lambda
+    visit_SetComp = visit_Lambda
+    visit_DictComp = visit_Lambda
+    visit_GeneratorExp = visit_Lambda
+
+    def visit_AugAssign(self, node):
+        if isinstance(node.target, ast.Name):
+            self._modify(node.target)
+        else:
+            self._store(node.target)
+        name = self._base_name(node.target)
+        if name is not None:
+            self.uses.add(name)
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            self._store(node)
+        self.generic_visit(node)
+
+    visit_Subscript = visit_Attribute
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Attribute):
+            self._modify(node.func.value)
+        if self._depth == 0:
+            args = []
+            for arg in node.args + [kw.value for kw in node.keywords]:
+                if isinstance(arg, ast.Starred):
+                    arg = arg.value
+                if isinstance(arg, ast.Name):
+                    args.append(arg.id)
+            targets = (self._assigned[1] if node is self._assigned[0]
+                       else [])
+            self.calls.append(_Call(self._dotted_name(node.func),
+                                    self._base_name(node.func),
+                                    node is self._discarded,
+                                    args, targets))
+        self.generic_visit(node)
+
+    def visit_Expr(self, node):
+        self._discarded = node.value
+        self.generic_visit(node)
+
+
+def _collect(block):
+    collector = _NameCollector()
+    collector.visit(ast.parse(block))
+    # A name that is replaced is not also modified.
+    collector.mods -= collector.defs
+    return collector
+
+
+def block_names(block):
+    """
+    Return the names defined, modified and used by the code `block`.
+
+    The return value is a tuple of three sets `(defs, mods, uses)`.
+    Raises `SyntaxError` if `block` can not be parsed.
+    """
+    collector = _collect(block)
+    return collector.defs, collector.mods, collector.uses
+
+
+def _is_pure(origin):
+    return origin in _pure_functions or origin.startswith(_pure_prefixes)
+
+
+def def_use_graph(code):
+    """
+    Build the def-use graph of the blocks in `code`.
+
+    `code` is a list of strings, as returned by `extract_example`.
+    Returns a list `deps` with the same length as `code`, where `deps[k]`
+    is the set of indices of the blocks that define or modify a name used
+    by block `k` (and that can reach block `k`).  Blank blocks and blocks
+    that can not be parsed have no dependencies.
+
+    The state of each imported package is a name in the graph (e.g.
+    '<numpy>'; see `_state_key`) that is used by every use of a name
+    imported from the package.  It is modified by
+
+    * an attribute or subscript assignment on an imported name, e.g.
+      `mpl.rcParams[key] = value`;
+    * a call of an imported function whose result is discarded, e.g.
+      `np.set_printoptions(precision=3)` or `seed(1)`, unless the
+      function is known to be pure (see `_pure_functions`);
+    * a call of a function in `_stateful_prefixes`, or of a method in
+      `_stateful_methods`, e.g. `r = np.random.rand(3)`;
+    * a change of a name bound to the result of a function in
+      `_state_result_prefixes`, e.g. `ax.plot(x)` after
+      `fig, ax = plt.subplots()`;
+    * a call of a function defined in an earlier block that uses a name
+      imported from the package.
+
+    The names passed to a call whose result is discarded are modified,
+    unless the function is known to be pure, and a change of a name also
+    changes its aliases (e.g. `y[0] = 5` after `y = x` changes `x`).
+
+    A block that uses a function (or class or lambda) defined in an
+    earlier block also depends on the blocks that define the free names
+    of the function when it is used, because that is when the function is
+    called.
+    """
+    # reaching[name] is the list of blocks whose definition of `name`
+    # reaches the current block: the last block that replaced `name`,
+    # followed by the blocks that modified it since then.
+    reaching = {}
+    # imports[name] is the fully qualified name of an imported name.
+    imports = {}
+    # state[name] is the state key of the package whose state includes
+    # the object bound to `name`.
+    state = {}
+    # functions[name] is the set of free names of the function bound
+    # to `name`.
+    functions = {}
+    # aliases[name] is the set of names that might be bound to the same
+    # object as `name` (shared by all the names in the set).
+    aliases = {}
+    deps = []
+
+    def _closure(names):
+        # The names, and the free names of the functions among them.
+        result = set(names)
+        stack = [name for name in result if name in functions]
+        while stack:
+            for name in functions[stack.pop()]:
+                if name not in result:
+                    result.add(name)
+                    if name in functions:
+                        stack.append(name)
+        return result
+
+    def _origin(call):
+        # The fully qualified name of the function of an imported call.
+        if call.base not in imports or call.dotted is None:
+            return None
+        rest = call.dotted[len(call.base):]
+        return imports[call.base] + rest
+
+    for k, block in enumerate(code):
+        try:
+            collector = _collect(block)
+        except SyntaxError:
+            deps.append(set())
+            continue
+
+        uses = _closure(collector.uses)
+        uses |= {state[name] for name in uses if name in state}
+        deps.append({i for name in uses for i in reaching.get(name, [])})
+
+        # The names modified by the block, other than the imported names,
+        # whose changes are changes of the state of their package.
+        mods = set(collector.mods)
+        for call in collector.calls:
+            origin = _origin(call)
+            if origin is not None:
+                pure = _is_pure(origin)
+            else:
+                pure = (call.base not in reaching and call.dotted is not None
+                        and _is_pure(call.dotted))
+            if call.discarded and not pure:
+                # The function might change its arguments in place, e.g.
+                # `np.random.shuffle(a)` or `np.add(x, 1, out=x)`.
+                mods.update(call.args)
+                if origin is not None:
+                    mods.add(state[call.base])
+            if origin is not None and origin.startswith(_stateful_prefixes):
+                mods.add(state[call.base])
+            if (call.dotted is not None
+                    and call.dotted.split('.')[-1] in _stateful_methods):
+                mods.add(_state_key('numpy'))
+            if call.base in functions:
+                mods.update(state[name] for name in _closure([call.base])
+                            if name in imports)
+        for name in collector.stores:
+            if name in imports:
+                mods.add(state[name])
+
+        for name in collector.defs:
+            reaching[name] = [k]
+            functions.pop(name, None)
+            imports.pop(name, None)
+            state.pop(name, None)
+            group = aliases.pop(name, None)
+            if group is not None:
+                group.discard(name)
+        for name, free in collector.functions.items():
+            if name in collector.defs:
+                functions[name] = free
+            else:
+                # Conditionally defined; it might be the old function.
+                functions[name] = functions.get(name, set()) | free
+        for name, origin in collector.imports.items():
+            imports[name] = origin
+            state[name] = _state_key(origin)
+        for call in collector.calls:
+            origin = _origin(call)
+            if call.base in state and call.base not in imports:
+                key = state[call.base]
+            elif (origin is not None
+                    and origin.startswith(_state_result_prefixes)):
+                key = state[call.base]
+            else:
+                continue
+            for name in call.targets:
+                state[name] = key
+        for target, source in collector.aliases:
+            if source in imports or source in functions:
+                continue
+            group = aliases.get(source, {source})
+            group.add(target)
+            for name in group:
+                aliases[name] = group
+
+        for name in list(mods):
+            mods |= aliases.get(name, set())
+        for name in list(mods):
+            if name in imports:
+                # Changes of imported names were handled above.
+                mods.discard(name)
+            elif name in state:
+                mods.add(state[name])
+        for name in mods:
+            if name not in collector.defs:
+                reaching.setdefault(name, []).append(k)
+    return deps
+
+
+def minimal_blocks(code, target, deps=None):
+    """
+    Return the sorted list of the indices of the blocks in `code` that
+    are needed to reproduce block `target` (including `target` itself),
+    according to the def-use graph `deps` (see `def_use_graph`).
+    """
+    if deps is None:
+        deps = def_use_graph(code)
+    needed = set()
+    stack = [target]
+    while stack:
+        k = stack.pop()
+        if k not in needed:
+            needed.add(k)
+            stack.extend(deps[k])
+    return sorted(needed)
+
+
+def setup_blocks(code):
+    """
+    Yield the blocks in `code` that are setup code: imports, and
+    assignments that are used by at least one later block.
+    """
+    deps = def_use_graph(code)
+    used = set().union(*deps)
+    for k, block in enumerate(code):
+        try:
+            body = ast.parse(block).body
+        except SyntaxError:
+            continue
+        if len(body) != 1:
+            continue
+        stmt = body[0]
+        if (isinstance(stmt, (ast.Import, ast.ImportFrom))
+                or (isinstance(stmt, ast.Assign) and k in used)):
+            # Normalize the formatting of the block.
+            yield ast.unparse(stmt)
+
+
+def repeated_setup(module_name):
+    """
+    Find the setup blocks that are repeated in the examples of the public
+    objects of `module_name`.
+
+    Returns a list of `(block, names)` pairs, where `names` is the sorted
+    list of the fully qualified names of the objects whose examples contain
+    `block`.  Only blocks that occur in the examples of two or more objects
+    are included, and the list is sorted by decreasing number of objects.
+    """
+    mod = importlib.import_module(module_name)
+    occurrences = defaultdict(set)
+    for name in getattr(mod, '__all__', dir(mod)):
+        if name.startswith('_'):
+            continue
+        fullname = f'{module_name}.{name}'
+        code = module_example(module_name, name)
+        if not code:
+            continue
+        for block in setup_blocks(code):
+            occurrences[block].add(fullname)
+    result = [(block, sorted(names))
+              for block, names in occurrences.items() if len(names) > 1]
+    result.sort(key=lambda item: (-len(item[1]), item[0]))
+    return result
+
+
+def _print_block(k, block):
+    lines = block.split('\n')
+    print(f'[{k:3d}] >>> {lines[0]}')
+    for nextline in lines[1:]:
+        print(f'      ... {nextline}')
+
+
+if __name__ == "__main__":
+    cmds = {'graph': 3, 'slice': 4, 'irun': 4, 'setup': 3}
+    if len(sys.argv) < 2 or cmds.get(sys.argv[1]) != len(sys.argv):
+        print(f'use: {sys.argv[0]} graph fully_qualified_scipy_name')
+        print(f'     {sys.argv[0]} slice fully_qualified_scipy_name '
+              'block_number')
+        print(f'     {sys.argv[0]} irun fully_qualified_scipy_name '
+              'block_number')
+        print(f'     {sys.argv[0]} setup fully_qualified_module_name')
+        sys.exit(0)
+
+    command = sys.argv[1]
+
+    if command == 'setup':
+        module_name = sys.argv[2].strip()
+        try:
+            repeated = repeated_setup(module_name)
+        except ImportError:
+            print(f"ERROR: Failed to import {module_name}", file=sys.stderr)
+            sys.exit(-1)
+        for block, names in repeated:
+            print(f'({len(names)}) {block}')
+            for name in names:
+                print(f'        {name}')
+        sys.exit(0)
+
+    fullname = sys.argv[2].strip()
+    try:
+        _, code = extract_example(fullname)
+    except RuntimeError as exc:
+        # Either the object can not be imported, or its example is
+        # malformed.
+        print(f"ERROR: {exc}", file=sys.stderr)
+        sys.exit(-1)
+
+    deps = def_use_graph(code)
+
+    match command:
+        case 'graph':
+            for k, block in enumerate(code):
+                if block.strip() == '':
+                    continue
+                _print_block(k, block)
+                if deps[k]:
+                    print(f'      depends on: {sorted(deps[k])}')
+        case 'slice' | 'irun':
+            try:
+                target = int(sys.argv[3])
+            except ValueError:
+                target = -1
+            if not 0 <= target < len(code):
+                print(f"ERROR: block number must be in [0, {len(code)})",
+                      file=sys.stderr)
+                sys.exit(-1)
+            needed = minimal_blocks(code, target, deps)
+            if command == 'slice':
+                for k in needed:
+                    _print_block(k, code[k])
+            else:
+                irun([code[k] for k in needed])
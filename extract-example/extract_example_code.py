@@ -1,8 +1,12 @@
 import ast
 from contextlib import redirect_stdout
+import hashlib
+import importlib
 from io import StringIO
+import json
+import os
 import sys
-from numpydoc.docscrape import NumpyDocString
+from numpydoc.docscrape import NumpyDocString, ParseError
 import scipy
 
 
@@ -213,11 +217,192 @@ def irun(code):
                 print(out)
 
 
+def check_scipy_module(module_name):
+    """
+    Raise a `ValueError` if `module_name` is not `scipy` or a SciPy module.
+
+    (`extract_example` looks up the objects starting from `scipy`, so it
+    only works for SciPy objects.)
+    """
+    if module_name != 'scipy' and not module_name.startswith('scipy.'):
+        raise ValueError(f"'{module_name}' is not a SciPy module")
+
+
+def module_example(module_name, name):
+    """
+    Extract the code from the Examples section of `name` in `module_name`.
+
+    Returns the list of lines of code, as in `extract_example`.  The list
+    is empty if the object has no docstring or if numpydoc can't parse its
+    docstring.  For other errors (e.g. a malformed '... ' line), a warning
+    is printed to stderr and None is returned.
+    """
+    obj = getattr(importlib.import_module(module_name), name, None)
+    if obj is not None and obj.__doc__ is None:
+        return []
+    fullname = f'{module_name}.{name}'
+    try:
+        _, code = extract_example(fullname)
+    except (ParseError, ValueError):
+        # numpydoc can't parse the docstring.
+        return []
+    except Exception as exc:
+        print(f"WARNING: Unable to extract the example of {fullname}: {exc}",
+              file=sys.stderr)
+        return None
+    return code
+
+
+def write_example(filename, fullname, code):
+    """
+    Write the example code `code` (a list of strings) to `filename`.
+    """
+    with open(filename, 'w') as f:
+        f.write(f"# Python code extracted from the 'Examples' section of\n"
+                f"# {fullname}\n")
+        f.write(f'# SciPy version: {scipy.__version__}\n\n')
+        f.write('\n'.join(code))
+        f.write('\n')
+
+
+def code_hash(code):
+    """
+    Return the SHA-256 hex digest of the example code `code`.
+
+    Only the code is hashed (not the header written by `write_example`),
+    so the hash does not change when only the SciPy version changes.
+    """
+    return hashlib.sha256('\n'.join(code).encode('utf-8')).hexdigest()
+
+
+def read_manifest(path):
+    """
+    Read the manifest written by `write_all`.
+
+    Returns a dict that maps the fully qualified names to the entries of
+    the manifest.  If the manifest does not exist, the dict is empty.  If
+    the manifest is corrupt or incomplete, a warning is printed to stderr
+    and the dict is empty, so all the examples are rewritten.
+    """
+    try:
+        with open(path) as f:
+            entries = json.load(f)['examples']
+        old_entries = {}
+        for entry in entries:
+            for key in ['name', 'file', 'scipy_version', 'sha256']:
+                if not isinstance(entry[key], str):
+                    raise ValueError(f"invalid '{key}' in entry")
+            if os.path.basename(entry['file']) != entry['file']:
+                raise ValueError(f"invalid file name '{entry['file']}'")
+            old_entries[entry['name']] = entry
+    except FileNotFoundError:
+        return {}
+    except (ValueError, KeyError, TypeError) as exc:
+        # json.JSONDecodeError is a subclass of ValueError.
+        print(f"WARNING: Ignoring the corrupt manifest '{path}' ({exc!r}); "
+              "all the examples will be rewritten.", file=sys.stderr)
+        return {}
+    return old_entries
+
+
+def write_all(module_name, outdir):
+    """
+    Write the examples of all the public objects in `module_name` to `outdir`.
+
+    Each example is written to `example_<name>.py`.  The directory also
+    gets an index (`index.md`) and a manifest (`manifest.json`) that records
+    the name, SciPy version and content hash of each example.  If the
+    manifest from a previous run is found, files whose hash is unchanged
+    are not rewritten, and files of objects that no longer have an example
+    are removed.  If extracting an example fails (see `module_example`),
+    the file from the previous run (if any) is kept.
+
+    Returns the number of files written, unchanged and removed.
+    Raises a `ValueError` if `module_name` is not a SciPy module.
+    """
+    check_scipy_module(module_name)
+    mod = importlib.import_module(module_name)
+    os.makedirs(outdir, exist_ok=True)
+    manifest_path = os.path.join(outdir, 'manifest.json')
+    old_entries = read_manifest(manifest_path)
+
+    entries = []
+    num_written = 0
+    num_unchanged = 0
+    names = sorted(name for name in getattr(mod, '__all__', dir(mod))
+                   if not name.startswith('_'))
+    for name in names:
+        fullname = f'{module_name}.{name}'
+        code = module_example(module_name, name)
+        if code is None:
+            old = old_entries.get(fullname)
+            if old is not None:
+                entries.append(old)
+            continue
+        if len(code) == 0:
+            continue
+        filename = f'example_{name}.py'
+        digest = code_hash(code)
+        old = old_entries.get(fullname)
+        if (old is not None and old['sha256'] == digest
+                and os.path.exists(os.path.join(outdir, filename))):
+            entries.append(old)
+            num_unchanged += 1
+            continue
+        write_example(os.path.join(outdir, filename), fullname, code)
+        entries.append({'name': fullname,
+                        'file': filename,
+                        'scipy_version': scipy.__version__,
+                        'sha256': digest})
+        num_written += 1
+
+    current = {entry['name'] for entry in entries}
+    num_removed = 0
+    for fullname, entry in old_entries.items():
+        if fullname not in current:
+            path = os.path.join(outdir, entry['file'])
+            if os.path.exists(path):
+                os.remove(path)
+                num_removed += 1
+
+    with open(manifest_path, 'w') as f:
+        json.dump({'module': module_name,
+                   'scipy_version': scipy.__version__,
+                   'examples': entries}, f, indent=2)
+        f.write('\n')
+
+    with open(os.path.join(outdir, 'index.md'), 'w') as f:
+        f.write(f"# Examples from {module_name}\n\n")
+        f.write(f"SciPy version: {scipy.__version__}\n\n")
+        for entry in entries:
+            f.write(f"* [`{entry['name']}`]({entry['file']})\n")
+
+    return num_written, num_unchanged, num_removed
+
+
 if __name__ == "__main__":
     cmds = ['write', 'run', 'irun']
+    if len(sys.argv) == 4 and sys.argv[1] == 'write-all':
+        module_name = sys.argv[2].strip()
+        outdir = sys.argv[3]
+        try:
+            counts = write_all(module_name, outdir)
+        except ImportError:
+            print(f"ERROR: Failed to import {module_name}", file=sys.stderr)
+            sys.exit(-1)
+        except ValueError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            sys.exit(-1)
+        num_written, num_unchanged, num_removed = counts
+        print(f"Examples from {module_name} written to '{outdir}': "
+              f"{num_written} written, {num_unchanged} unchanged, "
+              f"{num_removed} removed.")
+        sys.exit(0)
+
     if len(sys.argv) != 3 or sys.argv[1] not in cmds:
         print(f'use: {sys.argv[0]} command fully_qualified_scipy_name')
         print(f"where command must be one of {cmds}")
+        print(f'or:  {sys.argv[0]} write-all scipy_module_name outdir')
         sys.exit(0)
 
     command = sys.argv[1]
@@ -233,13 +418,7 @@ if __name__ == "__main__":
         case 'write':
             # Write the example code to a file.
             filename = f'example_{name}.py'
-            with open(filename, 'w') as f:
-                f.write(f"# Python code extracted from the 'Examples' section of\n"
-                        f"# {fullname}\n")
-                f.write(f'# SciPy version: {scipy.__version__}\n\n')
-                f.write('\n'.join(code))
-                f.write('\n')
-
+            write_example(filename, fullname, code)
             print(f"Code from the 'Examples' section of {fullname} "
                 f"written to '{filename}'.")
         case 'run':
@@ -1,11 +1,10 @@
 
 from collections import Counter
 import re
-import importlib
-import types
-import numpy as np
-import scipy
-from scipy._lib.uarray import _Function
+import sys
+from object_source import (function_types, module_objects, qualified,
+                           read_names, named_objects, package_version,
+                           add_source_arguments, select_modules)
 
 
 _docstring_sections = [
@@ -106,33 +105,6 @@ def find_duplicate_imports_in_examples(docstring):
     return result
 
 
-def module_objects(module_name, include_classes=True):
-    mod = importlib.import_module('.' + module_name, package='scipy')
-    objects = [(name, getattr(mod, name))
-               for name in getattr(mod, '__all__', dir(mod))
-               if not name.startswith('_')]
-    funcs = [item for item in objects
-             if isinstance(item[1], (types.FunctionType,
-                                     types.BuiltinFunctionType,
-                                     np.ufunc,
-                                     _Function))]
-    for item in funcs:
-        yield item
-
-    if include_classes:
-        classes = [item for item in objects
-                   if isinstance(item[1], type)]
-        for cls_item in classes:
-            name, cls = cls_item
-            for cls_attr in dir(cls):
-                cls_obj = getattr(cls, cls_attr)
-                if (callable(cls_obj)
-                        and not cls_attr.startswith('_')
-                        and not isinstance(cls_obj,
-                                           types.MemberDescriptorType)):
-                    yield ('.'.join([name, cls_attr]), cls_obj)
-
-
 all_modules = ['cluster.hierarchy', 'cluster.vq', 'constants', 'datasets',
                'differentiate',
                'fft', 'fftpack', 'integrate', 'interpolate',
@@ -153,14 +125,46 @@ skip = [
     'integrate.cumtrapz', 'integrate.simps',
 ]
 
+
+def docstring_issues(docstring, args):
+    """
+    Return a list of the lines that describe the issues in `docstring`.
+    """
+    result = check_headings(docstring, args)
+    if is_missing_import_np(docstring):
+        result.append("missing 'import numpy as np' in 'Examples'")
+    dup_imports = find_duplicate_imports_in_examples(docstring)
+    if dup_imports:
+        result.append("duplicated imports in Examples:")
+        for line in dup_imports:
+            result.append(f"    {line}")
+    return result
+
+
+def find_issues(items, args, skip=()):
+    """
+    Generate the `(name, issues)` pairs for the `(name, obj)` pairs in
+    `items` whose docstring has issues.  Names in `skip` are not checked.
+    """
+    for name, obj in items:
+        if name not in skip:
+            issues = docstring_issues(obj.__doc__, args)
+            if issues:
+                yield name, issues
+
+
 if __name__ == "__main__":
-    # import sys
     import argparse
     parser = argparse.ArgumentParser(
         prog='find_docstring_issues.py',
-        description=('Check SciPy functions for docstring issues'),
+        description=('Check functions for docstring issues'),
     )
-    parser.add_argument('modules', nargs='*', default=all_modules)
+    parser.add_argument('modules', nargs='*',
+                        help=('Modules to check, relative to the package. '
+                              'The default for SciPy is `all_modules`; '
+                              'for other packages, the public modules are '
+                              'found automatically.'))
+    add_source_arguments(parser, 'functions')
     parser.add_argument('-r', '--ignore-missing-returns', action='store_true',
                         help="Ignore missing 'Returns' section.")
     parser.add_argument('-s', '--ignore-see-also-case', action='store_true',
@@ -168,26 +172,32 @@ if __name__ == "__main__":
                               'section title'))
     args = parser.parse_args()
 
-    print(f"scipy version {scipy.__version__}")
+    package = args.package
+    print(f"{package} version {package_version(package)}")
+
+    module_names, skip_names, options = select_modules(
+        package, all_modules, skip, names=args.names is not None)
+    module_names = args.modules or module_names
 
-    for module_name in args.modules:
+    if args.names is not None:
         print()
-        print(f"=== {module_name} ===")
-        for obj_name, obj in module_objects(module_name,
-                                            include_classes=False):
-            full_name = module_name + '.' + obj_name
-            if full_name not in skip:
-                docstring = obj.__doc__
-                sections_issues = check_headings(docstring, args)
-                missing_import_np = is_missing_import_np(docstring)
-                dup_imports = find_duplicate_imports_in_examples(docstring)
-                if sections_issues or missing_import_np or dup_imports:
-                    print(full_name)
-                for line in sections_issues:
+        items = ((name, obj)
+                 for name, obj in named_objects(read_names(args.names))
+                 if isinstance(obj, function_types))
+        for name, issues in find_issues(items, args, skip_names):
+            print(name)
+            for line in issues:
+                print(f'    {line}')
+            sys.stdout.flush()
+    else:
+        for module_name in module_names:
+            print()
+            print(f"=== {module_name or package} ===")
+            items = qualified(module_name,
+                              module_objects(module_name,
+                                             include_classes=False,
+                                             **options))
+            for full_name, issues in find_issues(items, args, skip_names):
+                print(full_name)
+                for line in issues:
                     print(f'    {line}')
-                if missing_import_np:
-                    print("    missing 'import numpy as np' in 'Examples'")
-                if dup_imports:
-                    print("    duplicated imports in Examples:")
-                    for line in dup_imports:
-                        print(f"        {line}")
@@ -2,13 +2,16 @@
 Find scipy functions whose docstrings do not contain "Examples".
 
 This looks for *functions* only, not all callables.
+
+By default, the functions in the modules listed in `modules` are checked;
+see `object_source` for the `--package` and `--names` options.
 """
 
-import importlib
-import types
-import numpy as np
-import scipy
-from scipy._lib.uarray import _Function
+import argparse
+import sys
+from object_source import (function_types, module_objects, qualified,
+                           read_names, named_objects, package_version,
+                           add_source_arguments, select_modules)
 
 
 # Note: fftpack and stats.mstats are intentionally not included.
@@ -25,35 +28,73 @@ modules = ["cluster.hierarchy", "cluster.vq", "constants", "datasets",
 skip = ["integrate.cumtrapz", "integrate.simps", "integrate.trapz",
         "ndimage.sum", "signal.cmplx_sort"]
 
-print(f"scipy version {scipy.__version__}")
-print()
-
-total = 0
-for module_name in modules:
-    mod = importlib.import_module("." + module_name, package="scipy")
-    objects = [(name, getattr(mod, name))
-               for name in getattr(mod, "__all__", dir(mod))
-               if not name.startswith("_")]
-    funcs = [item for item in objects
-             if isinstance(item[1], (types.FunctionType,
-                                     types.BuiltinFunctionType,
-                                     np.ufunc,
-                                     _Function))]
-    noex = [item for item in funcs
-            if ((module_name + "." + item[0]) not in skip and
-                (item[1].__doc__ is None or
-                ("is deprecated" not in item[1].__doc__) and
-                ("Examples" not in item[1].__doc__)))]
-    if len(noex) > 0:
-        noex.sort()
-        total += len(noex)
-        print(f"{module_name} ({len(noex)})")
-        for name, func in noex:
-            print("   ", name, end="")
-            if func.__doc__ is None:
-                print(" \t[no docstring]")
-            else:
-                print()
-
-print()
-print(f"Found {total} functions")
+
+def is_missing_examples(docstring):
+    return (docstring is None or
+            ("is deprecated" not in docstring) and
+            ("Examples" not in docstring))
+
+
+def find_missing_examples(items, skip=()):
+    """
+    Generate the `(name, func)` pairs from `items` where `func` is a
+    function whose docstring does not have an Examples section.
+    Names in `skip` are not checked.
+    """
+    for name, obj in items:
+        if (isinstance(obj, function_types)
+                and name not in skip
+                and is_missing_examples(obj.__doc__)):
+            yield name, obj
+
+
+def print_function(name, func):
+    print("   ", name, end="")
+    if func.__doc__ is None:
+        print(" \t[no docstring]")
+    else:
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='find_functions_missing_examples.py',
+        description=('Find functions whose docstrings do not '
+                     'contain "Examples"'),
+    )
+    add_source_arguments(parser, 'functions')
+    args = parser.parse_args()
+    package = args.package
+
+    print(f"{package} version {package_version(package)}")
+    print()
+
+    module_names, skip_names, options = select_modules(
+        package, modules, skip, names=args.names is not None)
+
+    total = 0
+    if args.names is not None:
+        items = named_objects(read_names(args.names))
+        for name, func in find_missing_examples(items, skip_names):
+            total += 1
+            print_function(name, func)
+            sys.stdout.flush()
+    else:
+        for module_name in module_names:
+            items = qualified(module_name,
+                              module_objects(module_name,
+                                             include_classes=False,
+                                             **options))
+            noex = sorted(find_missing_examples(items, skip_names))
+            if len(noex) > 0:
+                total += len(noex)
+                print(f"{module_name or package} ({len(noex)})")
+                for name, func in noex:
+                    print_function(name.removeprefix(module_name + '.'), func)
+
+    print()
+    print(f"Found {total} functions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 """
 Find scipy functions and methods whose docstrings contain "Examples" and
 use 'np.' but do not have 'import numpy as np'.
+
+By default, the functions and the methods of the classes in the modules
+listed in `modules` are checked; see `object_source` for the `--package`
+and `--names` options.
 """
 
-import importlib
-import types
-import numpy as np
-import scipy
-from scipy._lib.uarray import _Function
+import argparse
+import sys
+from object_source import (module_objects, qualified, read_names,
+                           named_objects, package_version,
+                           add_source_arguments, select_modules)
 
 
 def is_missing_import_np(docstring):
@@ -36,51 +40,72 @@ skip = ['integrate.trapezoid', 'integrate.trapz', 'special.sinc',
         'fftpack.fftfreq', 'fftpack.fftshift', 'fftpack.ifftshift',
         'fft.fftfreq', 'fft.fftshift', 'fft.ifftshift', 'fft.rfftfreq']
 
-print(f"scipy version {scipy.__version__}")
-print()
-
-total = 0
-for module_name in modules:
-    mod = importlib.import_module('.' + module_name, package='scipy')
-    objects = [(name, getattr(mod, name))
-               for name in getattr(mod, '__all__', dir(mod))
-               if not name.startswith('_')]
-    funcs = [item for item in objects
-             if isinstance(item[1], (types.FunctionType,
-                                     types.BuiltinFunctionType,
-                                     np.ufunc,
-                                     _Function))]
-    no_np = [item for item in funcs
-             if (((module_name + '.' + item[0]) not in skip)
-                 and is_missing_import_np(item[1].__doc__))]
-
-    method_no_np = []
-    classes = [item for item in objects
-               if isinstance(item[1], type)]
-    for cls_item in classes:
-        name, cls = cls_item
-        for cls_attr in dir(cls):
-            cls_obj = getattr(cls, cls_attr)
-            if (callable(cls_obj)
-                    and not cls_attr.startswith('_')
-                    and not isinstance(cls_obj, types.MemberDescriptorType)
-                    and is_missing_import_np(cls_obj.__doc__)):
-                method_no_np.append((name, cls_attr))
-
-    num_found = len(no_np) + len(method_no_np)
-    if num_found > 0:
-        total += num_found
-        print(module_name, f"({num_found})")
-        no_np.sort()
-        for name, func in no_np:
-            print("   ", name,)
-
-        prev_name = None
-        for name, cls_attr in method_no_np:
-            if name != prev_name:
-                print(f'    {name} (class)')
-                prev_name = name
-            print(f'        .{cls_attr}')
-
-print()
-print(f"Found {total} objects missing 'import numpy as np'")
+
+def find_missing_import_np(items, skip=()):
+    """
+    Generate the `(name, obj)` pairs from `items` where the docstring of
+    `obj` is missing 'import numpy as np'.  Names in `skip` are not checked.
+    """
+    for name, obj in items:
+        if name not in skip and is_missing_import_np(obj.__doc__):
+            yield name, obj
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='find_missing_import_np.py',
+        description=("Find functions and methods whose 'Examples' "
+                     "use 'np.' without 'import numpy as np'"),
+    )
+    add_source_arguments(parser)
+    args = parser.parse_args()
+    package = args.package
+
+    print(f"{package} version {package_version(package)}")
+    print()
+
+    module_names, skip_names, options = select_modules(
+        package, modules, skip, names=args.names is not None)
+
+    total = 0
+    if args.names is not None:
+        items = named_objects(read_names(args.names))
+        for name, obj in find_missing_import_np(items, skip_names):
+            total += 1
+            print("   ", name)
+            sys.stdout.flush()
+    else:
+        for module_name in module_names:
+            items = qualified(module_name,
+                              module_objects(module_name, **options))
+            no_np = []
+            method_no_np = []
+            for name, obj in find_missing_import_np(items, skip_names):
+                name = name.removeprefix(module_name + '.')
+                if '.' in name:
+                    # A method, e.g. 'Rotation.as_quat'.
+                    method_no_np.append(tuple(name.split('.', 1)))
+                else:
+                    no_np.append(name)
+
+            num_found = len(no_np) + len(method_no_np)
+            if num_found > 0:
+                total += num_found
+                print(module_name or package, f"({num_found})")
+                no_np.sort()
+                for name in no_np:
+                    print("   ", name,)
+
+                prev_name = None
+                for name, cls_attr in method_no_np:
+                    if name != prev_name:
+                        print(f'    {name} (class)')
+                        prev_name = name
+                    print(f'        .{cls_attr}')
+
+    print()
+    print(f"Found {total} objects missing 'import numpy as np'")
+
+
+if __name__ == "__main__":
+    main()
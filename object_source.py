@@ -0,0 +1,279 @@
+"""
+Sources of (name, object) pairs for the docstring checkers.
+
+The sources are generators, so a checker can consume an arbitrarily long
+stream of objects (e.g. fully qualified names read from a file or from
+stdin) without holding the whole list in memory, and can report its
+findings as soon as they are found.
+
+The checkers share their options for selecting the objects to check (see
+`add_source_arguments` and `select_modules`).  By default, the objects in
+the SciPy modules listed by the checker are checked.  With `--package
+NAME`, the public modules of another package are found and checked
+instead.  With `--names FILE`, the fully qualified names of the objects to
+check are read from FILE (use '-' for stdin).
+"""
+
+import argparse
+import importlib
+import pkgutil
+import sys
+import types
+import numpy as np
+
+try:
+    from scipy._lib.uarray import _Function
+except ImportError:
+    # SciPy is not installed; only needed when checking SciPy itself.
+    _Function = None
+
+
+function_types = (types.FunctionType,
+                  types.BuiltinFunctionType,
+                  np.ufunc)
+if _Function is not None:
+    function_types += (_Function,)
+
+
+def import_module(module_name, package='scipy'):
+    """
+    Import the module `module_name` of `package`.
+
+    `module_name` is relative to `package` (e.g. 'special' or
+    'sparse.linalg'); the empty string is the package itself.
+    """
+    if module_name:
+        return importlib.import_module('.' + module_name, package=package)
+    return importlib.import_module(package)
+
+
+def package_version(package):
+    """
+    Return the version of `package`, or 'unknown' if it does not have
+    a `__version__` attribute.
+    """
+    return getattr(import_module('', package), '__version__', 'unknown')
+
+
+def _is_public(name):
+    return not (name.startswith('_')
+                or name in ('test', 'tests', 'conftest'))
+
+
+def _public_submodules(pkg, prefix):
+    for info in pkgutil.iter_modules(pkg.__path__):
+        if not _is_public(info.name):
+            continue
+        name = prefix + info.name
+        yield name
+        if info.ispkg:
+            try:
+                subpkg = importlib.import_module(pkg.__name__ + '.'
+                                                 + info.name)
+            except Exception:
+                # The subpackage is skipped; `module_objects` warns when
+                # it fails to import it.
+                continue
+            yield from _public_submodules(subpkg, name + '.')
+
+
+def discover_modules(package):
+    """
+    Generate the names of the public modules of `package`, relative to
+    `package`.
+
+    The package itself is generated first, as the empty string.  A module
+    is public if none of the parts of its name start with '_', and the
+    test modules are skipped.  Only the public subpackages are imported
+    to find their modules; subpackages that fail to import are not
+    searched.
+    """
+    pkg = import_module('', package)
+    yield ''
+    if hasattr(pkg, '__path__'):
+        # A package, not a plain module.
+        yield from _public_submodules(pkg, '')
+
+
+def _in_package(obj, package):
+    module = getattr(obj, '__module__', None) or ''
+    return module == package or module.startswith(package + '.')
+
+
+def module_objects(module_name, include_classes=True, package='scipy',
+                   own_only=False, seen=None):
+    """
+    Generate the public functions (and methods of public classes) of the
+    module `module_name` of `package` (e.g. 'special' or 'sparse.linalg').
+
+    Yields `(name, obj)` pairs, where `name` is relative to the module.
+    The functions are generated first, followed by the methods of the
+    classes (if `include_classes` is True), with names such as
+    'Rotation.as_quat'.
+
+    If `own_only` is True, only the objects whose `__module__` is in
+    `package` are generated, so names imported from other libraries
+    (e.g. `os.path.join`) are skipped.  If `seen` is a dict, it maps
+    `id(obj)` to `obj` for the objects already generated, and those
+    objects are not generated again; pass the same dict to the calls for
+    all the modules of a package to generate each object only once.
+    """
+    try:
+        mod = import_module(module_name, package)
+    except Exception as exc:
+        # Discovered modules can fail to import, e.g. because of a
+        # missing optional dependency.
+        fullname = f'{package}.{module_name}' if module_name else package
+        print(f"WARNING: Unable to import '{fullname}': {exc}",
+              file=sys.stderr)
+        return
+
+    def _keep(obj):
+        if own_only and not _in_package(obj, package):
+            return False
+        if seen is not None:
+            # The object is kept in `seen`, so its id is not reused.
+            if id(obj) in seen:
+                return False
+            seen[id(obj)] = obj
+        return True
+
+    names = [name for name in getattr(mod, '__all__', dir(mod))
+             if not name.startswith('_')]
+    for name in names:
+        # Some packages list names in __all__ that don't exist.
+        obj = getattr(mod, name, None)
+        if isinstance(obj, function_types) and _keep(obj):
+            yield name, obj
+
+    if include_classes:
+        for name in names:
+            cls = getattr(mod, name, None)
+            if not isinstance(cls, type):
+                continue
+            if own_only and not _in_package(cls, package):
+                continue
+            for cls_attr in dir(cls):
+                cls_obj = getattr(cls, cls_attr)
+                if (callable(cls_obj)
+                        and not cls_attr.startswith('_')
+                        and not isinstance(cls_obj,
+                                           types.MemberDescriptorType)
+                        and _keep(cls_obj)):
+                    yield '.'.join([name, cls_attr]), cls_obj
+
+
+def add_source_arguments(parser, what='objects'):
+    """
+    Add the `--package` and `--names` options, which select the objects
+    to check, to the `argparse` parser of a checker.
+
+    `what` is the kind of object checked, used in the help.
+    """
+    parser.add_argument('-p', '--package', default='scipy',
+                        help=("The package to check (default: scipy).  "
+                              "For packages other than SciPy, the public "
+                              "modules of the package are found "
+                              "automatically."))
+    parser.add_argument('-n', '--names', type=argparse.FileType('r'),
+                        help=(f"Read the fully qualified names of the {what} "
+                              "to check from this file ('-' for stdin) "
+                              "instead of checking the modules, and print "
+                              "the findings as they are found."))
+
+
+def select_modules(package, modules, skip, names=False):
+    """
+    Return `(module_names, skip_names, options)` for checking `package`.
+
+    For SciPy, `modules` and `skip` (the checker's lists of the modules
+    to check and of the names not to check, relative to `scipy`) are
+    used.  For other packages, the public modules are found with
+    `discover_modules` and no names are skipped.  If `names` is True (the
+    objects are read with `--names`), `skip_names` are fully qualified.
+
+    `options` are the keyword arguments for `module_objects`: for
+    packages other than SciPy, only the package's own objects are
+    generated, and each object is generated only once, even if it is
+    available in several modules.
+    """
+    if package == 'scipy':
+        module_names = modules
+        skip_names = skip
+        options = dict(package=package)
+    else:
+        module_names = discover_modules(package)
+        skip_names = []
+        options = dict(package=package, own_only=True, seen={})
+    if names:
+        skip_names = [package + '.' + name for name in skip_names]
+    return module_names, skip_names, options
+
+
+def qualified(module_name, items):
+    """
+    Prefix the names in the `(name, obj)` pairs of `items` with
+    `module_name`.  (If `module_name` is the empty string, the names are
+    not changed.)
+    """
+    prefix = module_name + '.' if module_name else ''
+    for name, obj in items:
+        yield prefix + name, obj
+
+
+def read_names(f):
+    """
+    Generate the names in the file `f`, one per line.
+
+    Blank lines and lines that start with '#' are ignored.
+    """
+    for line in f:
+        name = line.strip()
+        if name and not name.startswith('#'):
+            yield name
+
+
+def resolve_name(fullname):
+    """
+    Return the object with the fully qualified name `fullname`, e.g.
+    'scipy.special.logsumexp' or 'scipy.stats.rv_continuous.pdf'.
+
+    The longest prefix of `fullname` that can be imported is imported,
+    and the rest of the name is looked up with `getattr`.
+    Raises `RuntimeError` if the object can not be found, or if its module
+    raises an exception when imported.
+    """
+    parts = fullname.split('.')
+    for k in range(len(parts), 0, -1):
+        module_name = '.'.join(parts[:k])
+        try:
+            obj = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        except Exception as exc:
+            # The module exists, but raised an exception when imported.
+            raise RuntimeError(f"Unable to import '{module_name}': "
+                               f"{exc}") from exc
+        try:
+            for attr in parts[k:]:
+                obj = getattr(obj, attr)
+        except AttributeError:
+            break
+        return obj
+    raise RuntimeError(f"Unable to find '{fullname}'")
+
+
+def named_objects(fullnames):
+    """
+    Generate the objects with the fully qualified names `fullnames`.
+
+    Yields `(fullname, obj)` pairs.  A warning is printed to stderr for
+    each name that can not be found.
+    """
+    for fullname in fullnames:
+        try:
+            obj = resolve_name(fullname)
+        except RuntimeError as exc:
+            print(f"WARNING: {exc}", file=sys.stderr)
+            continue
+        yield fullname, obj